@@ -2,21 +2,42 @@
 """Generate Oxford 3000 flashcard dataset with Russian translations."""
 from __future__ import annotations
 
+import functools
+import hashlib
 import json
+import os
+import pickle
 import re
+import sys
+from bisect import bisect_right
 from collections import defaultdict
+from concurrent.futures import ProcessPoolExecutor
 from pathlib import Path
 from dataclasses import dataclass
-from typing import Dict, List, Optional
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple
 from urllib.request import urlretrieve
 
-from bs4 import BeautifulSoup  # type: ignore
+from bs4 import BeautifulSoup, SoupStrainer  # type: ignore
+
+try:
+    import ahocorasick  # type: ignore
+except ImportError:  # optional: speeds up the phrasal-verb fallback
+    ahocorasick = None
+
+try:
+    import orjson  # type: ignore
+except ImportError:  # optional: faster JSON output
+    orjson = None
 
 ROOT = Path(__file__).resolve().parent.parent
 DATA_DIR = ROOT / "data"
 OXFORD_LIST_PATH = DATA_DIR / "oxford-3000.json"
 OXFORD_HTML_PATH = ROOT / "oxford-3000" / "a.html"
 OXFORD_HTML_URL = "https://raw.githubusercontent.com/samuraitruong/oxford-3000/master/a.html"
+OXFORD_BASE_URL = "https://www.oxfordlearnersdictionaries.com"
+OXFORD_META_CACHE_PATH = DATA_DIR / ".oxford_meta.pkl"
+# bump when _parse output changes so stale caches are rebuilt
+OXFORD_META_CACHE_VERSION = 2
 OUTPUT_PATH = DATA_DIR / "cards.json"
 
 MUELLER_DICT_PATH = Path("/usr/share/dictd/mueller7.dict")
@@ -112,6 +133,20 @@ SUFFIX_RULES: List[Tuple[str, str]] = [
     ("s", ""),
 ]
 
+# longest suffix first, so one search finds the longest rule that applies
+_SUFFIX_RE = re.compile(
+    "(%s)$"
+    % "|".join(
+        re.escape(suffix)
+        for suffix in sorted((suffix for suffix, _ in SUFFIX_RULES), key=len, reverse=True)
+    )
+)
+# matched suffix -> every rule ending it (itself and shorter ones), in SUFFIX_RULES order
+_SUFFIX_CHAINS: Dict[str, List[Tuple[str, str]]] = {
+    suffix: [rule for rule in SUFFIX_RULES if suffix.endswith(rule[0])]
+    for suffix, _ in SUFFIX_RULES
+}
+
 
 @dataclass
 class DictionaryEntry:
@@ -119,43 +154,52 @@ class DictionaryEntry:
     body: str
 
 
+_PHONETIC_RE = re.compile(r"\[[^\]]*\]")
+_WS_RE = re.compile(r"\s+")
+_TRANSLATE_TABLE = str.maketrans("", "", "_\u200b")
+
+
 def _clean_text(text: str) -> str:
-    text = re.sub(r"\[[^\]]*\]", "", text)  # remove phonetics
-    text = text.replace("_", "")
-    text = text.replace("\u200b", "")
-    text = re.sub(r"\s+", " ", text)
+    if "[" in text:
+        text = _PHONETIC_RE.sub("", text)  # remove phonetics
+    text = text.translate(_TRANSLATE_TABLE)
+    text = _WS_RE.sub(" ", text)
     return text.strip()
 
 
-def parse_mueller(path: Path) -> Dict[str, List[DictionaryEntry]]:
+def parse_mueller(path: Path) -> Tuple[Dict[str, List[DictionaryEntry]], List[str]]:
+    """Return the Mueller entries and its non-empty stripped lines."""
     entries: Dict[str, List[DictionaryEntry]] = defaultdict(list)
+    lines: List[str] = []
     current_word: Optional[str] = None
     current_lines: List[str] = []
-    with path.open("r", encoding="utf-8", errors="ignore") as fh:
-        for raw_line in fh:
-            line = raw_line.rstrip("\n")
-            if not line:
-                continue
-            if not line.startswith((" ", "\t")):
-                if current_word and current_lines:
-                    entries[current_word.lower()].append(
-                        DictionaryEntry(current_word, "\n".join(current_lines))
-                    )
-                current_word = line.strip()
-                current_lines = []
-            else:
-                current_lines.append(line.strip())
+    data = path.read_text(encoding="utf-8", errors="ignore")
+    for line in data.split("\n"):
+        if not line:
+            continue
+        stripped = line.strip()
+        if stripped:
+            lines.append(stripped)
+        if line[:1] not in (" ", "\t"):
+            if current_word and current_lines:
+                entries[sys.intern(current_word.lower())].append(
+                    DictionaryEntry(current_word, "\n".join(current_lines))
+                )
+            current_word = stripped
+            current_lines = []
+        else:
+            current_lines.append(stripped)
     if current_word and current_lines:
-            entries[current_word.lower()].append(
+        entries[sys.intern(current_word.lower())].append(
             DictionaryEntry(current_word, "\n".join(current_lines))
         )
-    return entries
+    return entries, lines
 
 
 def parse_freedict(path: Path) -> Dict[str, List[DictionaryEntry]]:
     entries: Dict[str, List[DictionaryEntry]] = defaultdict(list)
-    with path.open("r", encoding="utf-8", errors="ignore") as fh:
-        lines = [line.strip() for line in fh if line.strip()]
+    data = path.read_text(encoding="utf-8", errors="ignore")
+    lines = [line for line in map(str.strip, data.split("\n")) if line]
     i = 0
     while i < len(lines) - 1:
         head = lines[i]
@@ -168,102 +212,280 @@ def parse_freedict(path: Path) -> Dict[str, List[DictionaryEntry]]:
             if translation.endswith(":"):
                 i += 1
                 continue
-            entries[word.lower()].append(DictionaryEntry(word, translation))
+            entries[sys.intern(word.lower())].append(DictionaryEntry(word, translation))
             i += 2
         else:
             i += 1
     return entries
 
 
-def load_mueller_lines(path: Path) -> List[str]:
-    with path.open("r", encoding="utf-8", errors="ignore") as fh:
-        return [line.strip() for line in fh if line.strip()]
+_TOKEN_RE = re.compile(r"[a-z]+")
+
+
+@dataclass
+class LineIndex:
+    lines: List[str]
+    lower: List[str]
+
+    @functools.cached_property
+    def words(self) -> Dict[str, List[int]]:
+        """Latin token -> indexes of the lines containing it, built on first use."""
+        words: Dict[str, List[int]] = defaultdict(list)
+        for idx, line in enumerate(self.lower):
+            for token in set(_TOKEN_RE.findall(line)):
+                words[token].append(idx)
+        return dict(words)
+
+
+def build_line_index(lines: List[str]) -> LineIndex:
+    return LineIndex(lines, [line.lower() for line in lines])
+
+
+def _new_metadata_entry() -> Dict[str, object]:
+    return {
+        "pos": set(),
+        "oxford_urls": set(),
+        "level": None,
+        "audio_uk": None,
+        "audio_us": None,
+    }
 
 
 class OxfordMetadata:
-    def __init__(self, html_path: Path) -> None:
+    def __init__(self, html_path: Path, cache_path: Path = OXFORD_META_CACHE_PATH) -> None:
         self.html_path = html_path
-        self.entries: Dict[str, Dict[str, object]] = defaultdict(dict)
-        self._parse()
+        self.cache_path = cache_path
+        self.entries: Dict[str, Dict[str, object]] = defaultdict(_new_metadata_entry)
+        self._load()
 
-    def _parse(self) -> None:
+    def _load(self) -> None:
         if not self.html_path.exists():
             self.html_path.parent.mkdir(parents=True, exist_ok=True)
             print("Downloading Oxford metadata HTML...")
             urlretrieve(OXFORD_HTML_URL, self.html_path)
-        html = self.html_path.read_text(encoding="utf-8", errors="ignore")
-        soup = BeautifulSoup(html, "html.parser")
-        for item in soup.select("li[data-hw]"):
+        html_bytes = self.html_path.read_bytes()
+        digest = hashlib.blake2b(html_bytes).hexdigest()[:16]
+        sig = f"{OXFORD_META_CACHE_VERSION}:{digest}"
+        cached = self._read_cache(sig)
+        if cached is not None:
+            self.entries = cached
+            return
+        self._parse(html_bytes.decode("utf-8", errors="ignore"))
+        self._write_cache(sig)
+
+    def _read_cache(self, sig: str) -> Optional[Dict[str, Dict[str, object]]]:
+        try:
+            with self.cache_path.open("rb") as fh:
+                cached = pickle.load(fh)
+        except (OSError, pickle.UnpicklingError, EOFError, AttributeError):
+            # a missing or broken cache means reparse
+            return None
+        if not isinstance(cached, dict) or cached.get("sig") != sig:
+            return None
+        return cached["entries"]
+
+    def _write_cache(self, sig: str) -> None:
+        try:
+            with self.cache_path.open("wb") as fh:
+                pickle.dump({"sig": sig, "entries": dict(self.entries)}, fh)
+        except OSError as exc:
+            print(f"Could not write metadata cache {self.cache_path}: {exc}")
+
+    def _parse(self, html: str) -> None:
+        # only <li data-hw> nodes are needed; skip building the rest of the tree
+        strainer = SoupStrainer("li", attrs={"data-hw": True})
+        soup = BeautifulSoup(html, "lxml", parse_only=strainer)
+        for item in soup.find_all("li", attrs={"data-hw": True}):
             word = item["data-hw"].strip()
-            entry = self.entries.setdefault(word, {
-                "pos": set(),
-                "oxford_urls": set(),
-                "level": None,
-                "audio_uk": None,
-                "audio_us": None,
-            })
+            entry = self.entries[word]
             level = item.get("data-ox3000")
             if level:
-                level = level.upper()
+                level = sys.intern(level.upper())
                 current = entry.get("level")
                 if not current or LEVEL_ORDER.get(level, 99) < LEVEL_ORDER.get(current, 99):
                     entry["level"] = level
-            pos_node = item.select_one(".pos")
+            pos_node = item.find(class_="pos")
             if pos_node:
-                entry["pos"].add(pos_node.get_text(strip=True))
+                entry["pos"].add(sys.intern(pos_node.get_text(strip=True)))
             link = item.find("a")
             if link and link.get("href"):
                 entry["oxford_urls"].add(link["href"])
-            for pron in item.select(".sound"):
+            for pron in item.find_all(class_="sound"):
                 src = pron.get("data-src-mp3")
                 if not src:
                     continue
-                if "pron-uk" in pron.get("class", []):
-                    entry.setdefault("audio_uk", src)
-                elif "pron-us" in pron.get("class", []):
-                    entry.setdefault("audio_us", src)
+                classes = pron.get("class", [])
+                if "pron-uk" in classes:
+                    if entry["audio_uk"] is None:
+                        entry["audio_uk"] = src
+                elif "pron-us" in classes:
+                    if entry["audio_us"] is None:
+                        entry["audio_us"] = src
 
         # convert sets to sorted lists
         for data in self.entries.values():
-            data["pos"] = sorted(data["pos"])
-            urls = sorted(data["oxford_urls"])
-            data["oxford_urls"] = [
-                f"https://www.oxfordlearnersdictionaries.com{u}" for u in urls
-            ]
-            if data.get("audio_uk"):
-                data["audio_uk"] = (
-                    f"https://www.oxfordlearnersdictionaries.com{data['audio_uk']}"
-                )
-            if data.get("audio_us"):
-                data["audio_us"] = (
-                    f"https://www.oxfordlearnersdictionaries.com{data['audio_us']}"
-                )
+            data["pos"] = sorted(data["pos"]) if data["pos"] else []
+            data["oxford_urls"] = (
+                [OXFORD_BASE_URL + u for u in sorted(data["oxford_urls"])]
+                if data["oxford_urls"]
+                else []
+            )
+            if data["audio_uk"]:
+                data["audio_uk"] = OXFORD_BASE_URL + data["audio_uk"]
+            if data["audio_us"]:
+                data["audio_us"] = OXFORD_BASE_URL + data["audio_us"]
 
     def get(self, word: str) -> Dict[str, object]:
         return self.entries.get(word, {})
 
 
-def normalize_phrase(line: str, phrase: str) -> str:
-    idx = line.lower().find(phrase)
-    if idx == -1:
-        return line
-    remainder = line[idx + len(phrase) :].strip(" -:;–—")
+def normalize_phrase(line: str, phrase: str, start: int) -> str:
+    """Text following ``phrase``, which matched ``line`` at index ``start``."""
+    remainder = line[start + len(phrase) :].strip(" -:;–—")
     return remainder or line
 
 
-def lookup_translation(
-    word: str,
+def _find_phrase(line_lower: str, phrase: str) -> int:
+    """Position of ``phrase`` in ``line_lower`` as whole words, or -1."""
+    idx = line_lower.find(phrase)
+    while idx != -1:
+        end = idx + len(phrase)
+        before = line_lower[idx - 1 : idx]
+        after = line_lower[end : end + 1]
+        if not _TOKEN_RE.match(before) and not _TOKEN_RE.match(after):
+            return idx
+        idx = line_lower.find(phrase, idx + 1)
+    return -1
+
+
+def search_phrase(phrase: str, index: LineIndex) -> Optional[str]:
+    """Return the first dictionary line mentioning ``phrase`` (phrasal verbs).
+
+    >>> search_phrase("mom", build_line_index(["moment; mom mama"]))
+    'mama'
+    """
+    if _TOKEN_RE.fullmatch(phrase):
+        candidates: Iterable[int] = index.words.get(phrase, ())
+    else:
+        candidates = range(len(index.lower))
+    for idx in candidates:
+        start = _find_phrase(index.lower[idx], phrase)
+        if start == -1:
+            continue
+        cleaned = _clean_text(normalize_phrase(index.lines[idx], phrase, start))
+        if cleaned:
+            return cleaned
+    # no whole-word hit: accept the phrase inside a longer word (e.g. math -> mathematics)
+    for line, line_lower in zip(index.lines, index.lower):
+        start = line_lower.find(phrase)
+        if start == -1:
+            continue
+        cleaned = _clean_text(normalize_phrase(line, phrase, start))
+        if cleaned:
+            return cleaned
+    return None
+
+
+def search_phrases(phrases: Iterable[str], index: LineIndex) -> Dict[str, str]:
+    """Resolve many phrases at once with a single Aho-Corasick pass over the lines."""
+    pending = set(phrases)
+    found: Dict[str, str] = {}
+    if ahocorasick is None:
+        for phrase in pending:
+            cleaned = search_phrase(phrase, index)
+            if cleaned:
+                found[phrase] = cleaned
+        return found
+    if not pending:
+        return found
+    automaton = ahocorasick.Automaton()
+    for phrase in pending:
+        automaton.add_word(phrase, phrase)
+    automaton.make_automaton()
+
+    corpus = "\n".join(index.lower)
+    offsets: List[int] = []
+    pos = 0
+    for line in index.lower:
+        offsets.append(pos)
+        pos += len(line) + 1
+
+    # first hit inside a longer word, used only when no whole-word hit exists
+    partial: Dict[str, str] = {}
+    for end, phrase in automaton.iter(corpus):
+        if phrase in found:
+            continue
+        start = end - len(phrase) + 1
+        whole = not _TOKEN_RE.match(corpus[start - 1 : start]) and not _TOKEN_RE.match(
+            corpus[end + 1 : end + 2]
+        )
+        if not whole and phrase in partial:
+            continue
+        idx = bisect_right(offsets, start) - 1
+        cleaned = _clean_text(normalize_phrase(index.lines[idx], phrase, start - offsets[idx]))
+        if not cleaned:
+            continue
+        if not whole:
+            partial[phrase] = cleaned
+            continue
+        found[phrase] = cleaned
+        if len(found) == len(pending):
+            break
+    for phrase, cleaned in partial.items():
+        found.setdefault(phrase, cleaned)
+    return found
+
+
+@functools.cache
+def _derived_candidates(lower: str) -> Tuple[str, ...]:
+    """Spelling variants of ``lower`` to try, in priority order."""
+    candidates: List[str] = []
+    # punctuation variations
+    stripped = lower.strip(".;:!,?()")
+    if stripped != lower:
+        candidates.append(stripped)
+    # numbering (e.g., close 1)
+    if " " in lower:
+        candidates.append(lower.split(" ", 1)[0])
+    # American -> British mapping
+    if lower in AMERICAN_TO_BRITISH:
+        candidates.append(AMERICAN_TO_BRITISH[lower])
+    # hyphen / spacing variations
+    if "-" in lower:
+        candidates.append(lower.replace("-", ""))
+        candidates.append(lower.replace("-", " "))
+    if " " in lower:
+        candidates.append(lower.replace(" ", ""))
+    # suffix stripping
+    match = _SUFFIX_RE.search(lower)
+    if match:
+        for suffix, replacement in _SUFFIX_CHAINS[match.group(1)]:
+            if len(lower) > len(suffix) + 2:
+                candidates.append(lower[: -len(suffix)] + replacement)
+    return tuple(candidates)
+
+
+def _variants(lower: str) -> Iterator[str]:
+    """Yield ``lower`` and then its spelling variants, breadth-first."""
+    order = [lower]
+    seen = {lower}
+    for candidate in order:
+        yield candidate
+        for derived in _derived_candidates(candidate):
+            if derived not in seen:
+                seen.add(derived)
+                order.append(derived)
+
+
+# word -> (translation, source) or None; the dictionaries are loaded once per run
+_TRANSLATION_CACHE: Dict[str, Optional[Tuple[str, str]]] = {}
+
+
+def _direct_translation(
+    lower: str,
     mueller: Dict[str, List[DictionaryEntry]],
-    mueller_lines: List[str],
     freedict: Dict[str, List[DictionaryEntry]],
-    visited: Optional[set[str]] = None,
-) -> Tuple[str, str]:
-    lower = word.lower()
-    if visited is None:
-        visited = set()
-    if lower in visited:
-        raise KeyError(f"No translation found for '{word}'")
-    visited.add(lower)
+) -> Optional[Tuple[str, str]]:
     if lower in MANUAL_TRANSLATIONS:
         return MANUAL_TRANSLATIONS[lower], "manual"
     if lower in mueller:
@@ -272,73 +494,116 @@ def lookup_translation(
     if lower in freedict:
         entry = freedict[lower][0]
         return _clean_text(entry.body), f"freedict:{entry.head}"
+    return None
 
-    # punctuation variations
-    stripped = lower.strip(".;:!,?()")
-    if stripped != lower:
-        text, src = lookup_translation(stripped, mueller, mueller_lines, freedict, visited)
-        if text:
-            return text, src
 
-    # numbering (e.g., close 1)
-    if " " in lower:
-        base = lower.split(" ", 1)[0]
-        try_text, source = lookup_translation(base, mueller, mueller_lines, freedict, visited)
-        if try_text:
-            return try_text, source
+def prime_translations(
+    words: Iterable[str],
+    mueller: Dict[str, List[DictionaryEntry]],
+    freedict: Dict[str, List[DictionaryEntry]],
+) -> None:
+    """Cache translations of words that are headwords as written.
+
+    The hits are found with set intersections against the dictionary key
+    views in one batch, so only the rest go through the candidate search.
+    """
+    lowered = {word: sys.intern(word.lower()) for word in words}
+    pending = set(lowered.values())
+    hits = (
+        (pending & MANUAL_TRANSLATIONS.keys())
+        | (pending & mueller.keys())
+        | (pending & freedict.keys())
+    )
+    for word, lower in lowered.items():
+        if lower in hits:
+            _TRANSLATION_CACHE[word] = _direct_translation(lower, mueller, freedict)
 
-    # American -> British mapping
-    if lower in AMERICAN_TO_BRITISH:
-        try_text, source = lookup_translation(
-            AMERICAN_TO_BRITISH[lower], mueller, mueller_lines, freedict, visited
-        )
-        if try_text:
-            return try_text, source
 
-    # hyphen / spacing variations
-    if "-" in lower:
-        try_text, source = lookup_translation(lower.replace("-", ""), mueller, mueller_lines, freedict, visited)
-        if try_text:
-            return try_text, source
-        try_text, source = lookup_translation(lower.replace("-", " "), mueller, mueller_lines, freedict, visited)
-        if try_text:
-            return try_text, source
-    if " " in lower:
-        try_text, source = lookup_translation(lower.replace(" ", ""), mueller, mueller_lines, freedict, visited)
-        if try_text:
-            return try_text, source
+def lookup_translation(
+    word: str,
+    mueller: Dict[str, List[DictionaryEntry]],
+    freedict: Dict[str, List[DictionaryEntry]],
+) -> Optional[Tuple[str, str]]:
+    """Translate ``word`` or one of its spelling variants; None if no entry."""
+    if word in _TRANSLATION_CACHE:
+        return _TRANSLATION_CACHE[word]
+    result: Optional[Tuple[str, str]] = None
+    for candidate in _variants(sys.intern(word.lower())):
+        result = _direct_translation(candidate, mueller, freedict)
+        if result is not None:
+            break
+    _TRANSLATION_CACHE[word] = result
+    return result
+
+
+# fanning out only pays off once the candidate search has enough words to chew on
+PARALLEL_MIN_WORDS = 1000
+
+_worker_dicts: Optional[
+    Tuple[Dict[str, List[DictionaryEntry]], Dict[str, List[DictionaryEntry]]]
+] = None
 
-    # suffix stripping
-    for suffix, replacement in SUFFIX_RULES:
-        if lower.endswith(suffix) and len(lower) > len(suffix) + 2:
-            candidate = lower[: -len(suffix)] + replacement
-            try_text, source = lookup_translation(candidate, mueller, mueller_lines, freedict, visited)
-            if try_text:
-                return try_text, source
-
-    # fallback: search entire dictionary lines for phrase (phrasal verbs)
-    phrase = lower
-    for line in mueller_lines:
-        if phrase in line.lower():
-            translation = normalize_phrase(line, phrase)
-            cleaned = _clean_text(translation)
-            if cleaned:
-                return cleaned, "mueller:line"
 
-    raise KeyError(f"No translation found for '{word}'")
+def _init_worker(
+    mueller: Dict[str, List[DictionaryEntry]],
+    freedict: Dict[str, List[DictionaryEntry]],
+) -> None:
+    global _worker_dicts
+    _worker_dicts = (mueller, freedict)
+
 
+def _translate_one(word: str) -> Optional[Tuple[str, str]]:
+    assert _worker_dicts is not None
+    mueller, freedict = _worker_dicts
+    return lookup_translation(word, mueller, freedict)
 
-def build_dataset() -> List[Dict[str, object]]:
-    mueller = parse_mueller(MUELLER_DICT_PATH)
-    mueller_lines = load_mueller_lines(MUELLER_DICT_PATH)
+
+def translate_words(
+    words: List[str],
+    mueller: Dict[str, List[DictionaryEntry]],
+    freedict: Dict[str, List[DictionaryEntry]],
+) -> Dict[str, Optional[Tuple[str, str]]]:
+    prime_translations(words, mueller, freedict)
+    pending = [word for word in dict.fromkeys(words) if word not in _TRANSLATION_CACHE]
+    if len(pending) >= PARALLEL_MIN_WORDS:
+        with ProcessPoolExecutor(
+            initializer=_init_worker, initargs=(mueller, freedict)
+        ) as executor:
+            results = executor.map(_translate_one, pending, chunksize=64)
+            _TRANSLATION_CACHE.update(zip(pending, results))
+    return {word: lookup_translation(word, mueller, freedict) for word in words}
+
+
+def build_dataset() -> Iterator[Dict[str, object]]:
+    mueller, mueller_lines = parse_mueller(MUELLER_DICT_PATH)
     freedict = parse_freedict(FREEDICT_PATH)
     metadata = OxfordMetadata(OXFORD_HTML_PATH)
 
     words = json.loads(OXFORD_LIST_PATH.read_text(encoding="utf-8"))
-    dataset: List[Dict[str, object]] = []
+
+    translations = translate_words(words, mueller, freedict)
+    # fallback: search entire dictionary lines for phrase (phrasal verbs),
+    # trying the word itself first and then its spelling variants
+    missing = {
+        word: list(_variants(word.lower()))
+        for word, found in translations.items()
+        if found is None
+    }
+    phrases: Dict[str, str] = {}
+    if missing:
+        phrases = search_phrases(
+            (variant for variants in missing.values() for variant in variants),
+            build_line_index(mueller_lines),
+        )
 
     for word in words:
-        translation, source = lookup_translation(word, mueller, mueller_lines, freedict)
+        found = translations[word]
+        if found is None:
+            phrase = next((phrases[v] for v in missing[word] if v in phrases), None)
+            if phrase is None:
+                raise KeyError(f"No translation found for '{word}'")
+            found = phrase, "mueller:line"
+        translation, source = found
         meta = metadata.get(word)
         entry = {
             "word": word,
@@ -352,17 +617,30 @@ def build_dataset() -> List[Dict[str, object]]:
                 "us": meta.get("audio_us"),
             },
         }
-        dataset.append(entry)
+        yield entry
 
-    return dataset
+
+def _dump_entry(entry: Dict[str, object]) -> str:
+    if orjson is not None:
+        text = orjson.dumps(entry, option=orjson.OPT_INDENT_2).decode("utf-8")
+    else:
+        text = json.dumps(entry, ensure_ascii=False, indent=2)
+    # nest one level deeper, as json.dumps(dataset, indent=2) would
+    return "  " + text.replace("\n", "\n  ")
 
 
 def main() -> None:
-    dataset = build_dataset()
-    OUTPUT_PATH.write_text(
-        json.dumps(dataset, ensure_ascii=False, indent=2), encoding="utf-8"
-    )
-    print(f"Saved {len(dataset)} cards to {OUTPUT_PATH}")
+    # stream into a temporary file so a failed run leaves cards.json intact
+    tmp_path = OUTPUT_PATH.with_name(OUTPUT_PATH.name + ".tmp")
+    count = 0
+    with tmp_path.open("w", encoding="utf-8") as fh:
+        fh.write("[")
+        for count, entry in enumerate(build_dataset(), 1):
+            fh.write(",\n" if count > 1 else "\n")
+            fh.write(_dump_entry(entry))
+        fh.write("\n]" if count else "]")
+    os.replace(tmp_path, OUTPUT_PATH)
+    print(f"Saved {count} cards to {OUTPUT_PATH}")
 
 
 if __name__ == "__main__":